@@ -16,11 +16,13 @@ Base data class that is inherited by all data classes.
 A data defines data reading, parsing, batching, and other
 preprocessing operations.
 """
+import heapq
+import itertools
 import warnings
 from abc import ABC
 from typing import (
     Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence,
-    Tuple, TypeVar, Union)
+    Tuple, TypeVar, Union, cast)
 
 import torch
 from torch.utils.data import Dataset
@@ -42,6 +44,18 @@ __all__ = [
 RawExample = TypeVar('RawExample')  # type of a raw example loaded from source
 Example = TypeVar('Example')  # type of a data example
 
+# Placeholder for examples erased from `_CachedDataSource`.
+_ERASED = object()
+
+# Bitmask flags for dispatching in `DatasetBase`. See the properties with
+# corresponding names for details.
+_FLAG_RETURN_PROCESSED = 1
+_FLAG_PREFETCH_SOURCE = 2
+_FLAG_PREFETCH_PROCESSED = 4
+_FLAG_DELETE_SOURCE_IN_ADD_CACHE = 8
+_FLAG_YIELD_RAW_EXAMPLE = 16
+_FLAG_PREFETCH_UNTIL_CACHED = 32
+
 
 class DataSource(Generic[RawExample], ABC):
     r"""Base class for all data sources. A data source represents the *source*
@@ -54,6 +68,8 @@ class DataSource(Generic[RawExample], ABC):
     iterators, etc.)
     """
 
+    __slots__ = ()
+
     def __getitem__(self, index: int) -> RawExample:
         raise TypeError("This DataSource does not support random access")
 
@@ -74,6 +90,8 @@ class SequenceDataSource(DataSource[RawExample]):
             be iterable and supports `len`.
     """
 
+    __slots__ = ('_seq',)
+
     def __init__(self, sequence: Sequence[RawExample]):
         self._seq = sequence
 
@@ -98,6 +116,8 @@ class IterDataSource(DataSource[RawExample]):
         iterable: The Python iterable to read from.
     """
 
+    __slots__ = ('_iter',)
+
     def __init__(self, iterable: Iterable[RawExample]):
         self._iter = iterable
 
@@ -117,14 +137,19 @@ class ZipDataSource(DataSource[Tuple[RawExample, ...]]):
         sources: The list of data sources to combine.
     """
 
+    __slots__ = ('_sources', '_getters')
+
     def __init__(self, *sources: DataSource[RawExample]):
         self._sources = list(sources)
+        self._getters = [source.__getitem__ for source in self._sources]
 
     def __getitem__(self, index: int) -> Tuple[RawExample, ...]:
-        return tuple(source[index] for source in self._sources)
+        # A list is built to avoid the overhead of a generator frame.
+        # pylint: disable=bad-option-value,consider-using-generator
+        return tuple([getter(index) for getter in self._getters])
 
     def __iter__(self) -> Iterator[Tuple[RawExample, ...]]:
-        return zip(*[iter(source) for source in self._sources])
+        return zip(*map(iter, self._sources))
 
     def __len__(self) -> int:
         return min(len(source) for source in self._sources)
@@ -142,18 +167,20 @@ class FilterDataSource(DataSource[RawExample]):
         source: The data source to filter.
         filter_fn: A callable taking a raw example as argument and returning a
             boolean value, indicating whether the raw example should be
-            **kept**.
+            **kept**. If `None`, all raw examples are kept.
     """
 
+    __slots__ = ('_source', '_filter_fn')
+
     def __init__(self, source: DataSource[RawExample],
-                 filter_fn: Callable[[RawExample], bool]):
+                 filter_fn: Optional[Callable[[RawExample], bool]]):
         self._source = source
         self._filter_fn = filter_fn
 
     def __iter__(self) -> Iterator[RawExample]:
-        for sentence in self._source:
-            if self._filter_fn(sentence):
-                yield sentence
+        if self._filter_fn is None:
+            return iter(self._source)
+        return filter(self._filter_fn, self._source)
 
 
 class RecordDataSource(DataSource[Dict[str, RawExample]]):
@@ -169,23 +196,29 @@ class RecordDataSource(DataSource[Dict[str, RawExample]]):
             data sources to combine.
     """
 
+    __slots__ = ('_sources', '_keys', '_items')
+
     def __init__(self, sources: Dict[str, DataSource[RawExample]]):
         self._sources = sources
+        self._keys = tuple(sources.keys())
+        self._items = tuple((key, source.__getitem__)
+                            for key, source in sources.items())
 
     def __getitem__(self, index: int) -> Dict[str, RawExample]:
-        return {key: source[index] for key, source in self._sources.items()}
+        return {key: getter(index) for key, getter in self._items}
 
     def __iter__(self) -> Iterator[Dict[str, RawExample]]:
-        keys = list(self._sources.keys())
-        iterator = zip(*[iter(source) for source in self._sources.values()])
-        for values in iterator:
-            yield {key: value for key, value in zip(keys, values)}
+        keys = self._keys
+        for values in zip(*map(iter, self._sources.values())):
+            yield dict(zip(keys, values))
 
     def __len__(self) -> int:
         return min(len(source) for source in self._sources.values())
 
 
 class _TruncatedDataSource(DataSource[RawExample]):
+    __slots__ = ('_source', '_max_size')
+
     def __init__(self, data_source: DataSource[RawExample], max_size: int):
         self._source = data_source
         self._max_size = max_size
@@ -197,11 +230,7 @@ class _TruncatedDataSource(DataSource[RawExample]):
         return self._source[item]
 
     def __iter__(self) -> Iterator[RawExample]:
-        count = 0
-        iterator = iter(self._source)
-        while count < self._max_size:
-            yield next(iterator)
-            count += 1
+        return itertools.islice(self._source, self._max_size)
 
     def __len__(self) -> int:
         try:
@@ -215,22 +244,56 @@ class _TransformedDataSource(DataSource[Example], Generic[RawExample, Example]):
     r"""Data source by performing transformations on another data source.
     """
 
+    __slots__ = ('_source', '_process', '_source_getitem', '_source_len')
+
     def __init__(self, data_source: DataSource[RawExample],
                  process_fn: Callable[[RawExample], Example]):
         self._source = data_source
         self._process = process_fn
+        self._source_getitem = data_source.__getitem__
+        self._source_len = data_source.__len__
 
     def __getitem__(self, item):
-        return self._process(self._source[item])
+        return self._process(self._source_getitem(item))
 
     def __iter__(self):
         return map(self._process, iter(self._source))
 
     def __len__(self):
-        return len(self._source)
+        return self._source_len()
+
+
+class _FusedDataSource(_TransformedDataSource[RawExample, Example]):
+    r"""Data source by performing transformations on the first `max_size`
+    examples of another data source. This is equivalent to wrapping the data
+    source with :class:`_TruncatedDataSource` and then
+    :class:`_TransformedDataSource`, but saves one level of indirection on
+    each access.
+    """
+
+    __slots__ = ('_max_size',)
+
+    def __init__(self, data_source: DataSource[RawExample],
+                 process_fn: Callable[[RawExample], Example], max_size: int):
+        super().__init__(data_source, process_fn)
+        self._max_size = max_size
+
+    def __getitem__(self, item):
+        if item >= self._max_size:
+            raise IndexError(
+                f"Data index ({item}) out of range [0, {self._max_size})")
+        return self._process(self._source_getitem(item))
+
+    def __iter__(self):
+        return map(self._process,
+                   itertools.islice(self._source, self._max_size))
 
-    def __getattr__(self, item):
-        return getattr(self._source, item)
+    def __len__(self):
+        try:
+            length = min(self._source_len(), self._max_size)
+        except TypeError:
+            length = self._max_size
+        return length
 
 
 class _CachedDataSource(DataSource[RawExample]):
@@ -240,7 +303,10 @@ class _CachedDataSource(DataSource[RawExample]):
     `cache_strategy` and `shuffle_buffer_size` settings.
     """
 
-    _cache: Union[Dict[int, RawExample], List[RawExample]]
+    __slots__ = ('_source', '_iter', '_max_index', '_erase_after_access',
+                 '_cache', '_base_index', '_head', '_has_erased')
+
+    _cache: List[RawExample]
 
     def __init__(self, data_source: DataSource[RawExample],
                  erase_after_access: bool = True):
@@ -257,39 +323,170 @@ class _CachedDataSource(DataSource[RawExample]):
         self._iter = iter(data_source)
         self._max_index = -1
         self._erase_after_access = erase_after_access
-        if erase_after_access:
-            self._cache: Dict[int, RawExample] = {}
-        else:
-            self._cache: List[RawExample] = []
+        # When erasing after access, `_cache` acts as a sliding window over
+        # the prefetched examples: `_cache[0]` holds the example at index
+        # `_base_index`, and the first `_head` entries have all been erased.
+        # This avoids the hashing overhead of a dict keyed by index, while
+        # still allowing out-of-order access (e.g. with shuffle buffers).
+        self._cache = []
+        self._base_index = 0
+        self._head = 0
+        self._has_erased = False
 
     def __getitem__(self, index: int) -> RawExample:
         # If specified `index` is not yet prefetched (or has already been
         # accessed), this method may throw `IndexError` or `KeyError`.
-        example = self._cache[index]
-        if self._erase_after_access:
-            del self._cache[index]
+        if not self._erase_after_access:
+            return self._cache[index]
+        offset = index - self._base_index
+        if offset < 0:
+            raise KeyError(index)
+        example = self._cache[offset]
+        if example is _ERASED:
+            raise KeyError(index)
+        self._erase_offset(offset)
         return example
 
     def __iter__(self) -> Iterator[RawExample]:
         return iter(self._source)
 
     def prefetch(self, index: int):
-        while self._max_index < index:
-            example = next(self._iter)
-            self._max_index += 1
-            if self._erase_after_access:
-                self._cache[self._max_index] = example
-            else:
-                self._cache.append(example)  # type: ignore
+        num_examples = index - self._max_index
+        if num_examples <= 0:
+            return
+        # Pull all required examples in a single C-level loop, directly into
+        # the cache.
+        cache = self._cache
+        prev_len = len(cache)
+        cache.extend(itertools.islice(self._iter, num_examples))
+        num_fetched = len(cache) - prev_len
+        self._max_index += num_fetched
+        if num_fetched < num_examples:
+            raise StopIteration
+
+    def prefetch_all(self) -> None:
+        r"""Prefetch all remaining examples from the data source.
+        """
+        self._cache.extend(self._iter)
+        self._max_index = self._base_index + len(self._cache) - 1
+
+    def erase(self, index: int) -> None:
+        r"""Erase the cached example at :attr:`index`. Storage for erased
+        examples at the front of the cache is released in an amortized
+        fashion.
+
+        Raises `KeyError` if the example at :attr:`index` is not cached, or
+        has already been erased.
+        """
+        offset = index - self._base_index
+        if (not 0 <= offset < len(self._cache) or
+                self._cache[offset] is _ERASED):
+            raise KeyError(index)
+        self._erase_offset(offset)
+
+    def _erase_offset(self, offset: int) -> None:
+        cache = self._cache
+        cache[offset] = _ERASED  # type: ignore
+        self._has_erased = True
+        if offset == self._head:
+            head = offset + 1
+            while head < len(cache) and cache[head] is _ERASED:
+                head += 1
+            if 2 * head >= len(cache):
+                del cache[:head]
+                self._base_index += head
+                head = 0
+            self._head = head
 
     @property
     def max_index(self) -> int:
         return self._max_index
 
     def reset(self) -> None:
-        if self._erase_after_access:
+        # If no example has been erased, the cache still holds all examples
+        # read so far (e.g., after eager loading), and there's no need to read
+        # them from the data source again.
+        if self._erase_after_access and self._has_erased:
             self._iter = iter(self._source)
             self._max_index = -1
+            self._cache = []
+            self._base_index = 0
+            self._head = 0
+            self._has_erased = False
+
+
+ExampleSpec = Dict[str, Tuple[Tuple[int, ...], torch.dtype]]
+
+
+class _ContiguousCache:
+    r"""Cache for processed examples backed by pre-allocated contiguous
+    tensors. Each example is a dictionary mapping names to tensors of fixed
+    shapes, and is stored as a row in the tensor with the same name. This
+    class is only used internally in :class:`~texar.torch.data.DatasetBase`
+    when the `contiguous_cache` hyperparameter is `True`.
+
+    Examples must be added in order of their indices, which is guaranteed by
+    :class:`~texar.torch.data.DatasetBase`.
+    """
+
+    def __init__(self, spec: ExampleSpec, size: int):
+        r"""
+
+        Args:
+            spec: A dictionary mapping names to tuples of `(shape, dtype)`,
+                describing the tensors in each processed example.
+            size: The number of examples to allocate storage for.
+        """
+        self._keys = tuple(spec.keys())
+        self._storage = {
+            key: torch.empty((size, *shape), dtype=dtype)
+            for key, (shape, dtype) in spec.items()
+        }
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        # Rows beyond `_size` are uninitialized, so bounds are checked against
+        # the number of stored examples instead of the allocated storage.
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(
+                f"Cache index ({index}) out of range [0, {self._size})")
+        storage = self._storage
+        return {key: storage[key][index] for key in self._keys}
+
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        return map(self.__getitem__, range(self._size))
+
+    def append(self, example: Dict[str, torch.Tensor]) -> None:
+        index = self._size
+        for key in self._keys:
+            storage = self._storage[key]
+            value = example[key]
+            # Assignment would silently broadcast and cast mismatched values.
+            if (not torch.is_tensor(value) or
+                    value.shape != storage.shape[1:] or
+                    value.dtype != storage.dtype):
+                expected = (f"tensor of shape {tuple(storage.shape[1:])} and "
+                            f"dtype {storage.dtype}")
+                if torch.is_tensor(value):
+                    actual = (f"tensor of shape {tuple(value.shape)} and "
+                              f"dtype {value.dtype}")
+                else:
+                    actual = f"{type(value).__name__}"
+                raise ValueError(
+                    f"Expected '{key}' of processed examples to be a "
+                    f"{expected} as specified in `example_spec`, but got "
+                    f"{actual}")
+            storage[index] = value
+        self._size += 1
+
+    def extend(self, examples: Iterable[Dict[str, torch.Tensor]]) -> None:
+        for example in examples:
+            self.append(example)
 
 
 class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
@@ -453,6 +650,7 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
     # pylint: enable=line-too-long
 
     _source: DataSource[RawExample]
+    _transformed_source: _TransformedDataSource[RawExample, Example]
     _dataset_size: Optional[int]
 
     def __init__(self, source: DataSource[RawExample], hparams=None,
@@ -461,13 +659,22 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         self._hparams = HParams(hparams, self.default_hparams())
         self.device = device
 
-        if self._hparams.num_epochs != 1:
-            warnings.warn(f"'num_epochs' is set to {self._hparams.num_epochs}, "
+        # Cache frequently accessed hyperparameters, avoiding the overhead of
+        # `HParams` attribute lookup.
+        hparams = self._hparams
+        self._num_epochs = hparams.num_epochs
+        self._batch_size = hparams.batch_size
+        self._num_parallel_calls = hparams.num_parallel_calls
+        self._max_dataset_size = hparams.max_dataset_size
+        self._shuffle_buffer_size = hparams.shuffle_buffer_size
+
+        if self._num_epochs != 1:
+            warnings.warn(f"'num_epochs' is set to {self._num_epochs}, "
                           f"but will be treated as 1.")
 
         # Check and convert strategy hyperparameters.
-        self._lazy_strategy = _LazyStrategy(self._hparams.lazy_strategy)
-        self._cache_strategy = _CacheStrategy(self._hparams.cache_strategy)
+        self._lazy_strategy = _LazyStrategy(hparams.lazy_strategy)
+        self._cache_strategy = _CacheStrategy(hparams.cache_strategy)
         if self._lazy_strategy is _LazyStrategy.NONE:
             if self._cache_strategy is not _CacheStrategy.PROCESSED:
                 warnings.warn(
@@ -482,24 +689,34 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
                     f"strategy. This will be equivalent to 'loaded' cache "
                     f"strategy.")
                 self._cache_strategy = _CacheStrategy.LOADED
-        self._uses_multi_processing = self._hparams.num_parallel_calls > 0
-        self._parallelize_processing = self._hparams.parallelize_processing
+        self._uses_multi_processing = self._num_parallel_calls > 0
+        self._parallelize_processing = hparams.parallelize_processing
 
         self._processed_cache: List[Example] = []
         self._fully_cached = False
 
         # If specified maximum dataset size, wrap the data source. This is done
         # before caching to avoid caching excess elements.
-        if self._hparams.max_dataset_size != -1:
-            self._source = _TruncatedDataSource[RawExample](
-                self._source, self._hparams.max_dataset_size)
-
+        #
         # If processing should not be parallelized, combine processing with
         # loading by wrapping the data source. In this case, **processed** data
         # will be cached.
-        if (not self._parallelize_processing and
+        #
+        # When both apply, a single fused wrapper is used.
+        should_truncate = self._max_dataset_size != -1
+        should_transform = (
+                not self._parallelize_processing and
                 self._lazy_strategy is _LazyStrategy.ALL and
-                self._cache_strategy is not _CacheStrategy.LOADED):
+                self._cache_strategy is not _CacheStrategy.LOADED)
+        if should_truncate and should_transform:
+            self._transformed_source = _FusedDataSource[
+                RawExample, Example](self._source, self.process,
+                                     self._max_dataset_size)
+            self._source = self._transformed_source  # type: ignore
+        elif should_truncate:
+            self._source = _TruncatedDataSource[RawExample](
+                self._source, self._max_dataset_size)
+        elif should_transform:
             self._transformed_source = _TransformedDataSource[
                 RawExample, Example](self._source, self.process)
             self._source = self._transformed_source  # type: ignore
@@ -510,7 +727,9 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         if self._lazy_strategy is not _LazyStrategy.NONE:
             try:
                 self._dataset_size = len(self._source)
-                _ = self._source[0]
+                # Probe the unwrapped source, so that the first example is not
+                # processed only to be discarded.
+                _ = source[0]
             except TypeError:
                 self._supports_random_access = False
                 erase_after_access = (
@@ -529,30 +748,58 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
                 RawExample, Example](self._source, self.process)
             self._source = self._transformed_source  # type: ignore
 
-        # Simplify some logic-heavy checks.
-        self.__should_return_processed_examples = (
-                self._lazy_strategy is not _LazyStrategy.NONE and
+        # Simplify some logic-heavy checks. Results are packed into a bitmask
+        # so that checks on hot paths are a single bitwise AND.
+        flags = 0
+        if (self._lazy_strategy is not _LazyStrategy.NONE and
                 self._cache_strategy is _CacheStrategy.PROCESSED and
-                self._parallelize_processing)
-        self.__should_call_prefetch_source = (
-                self._lazy_strategy is _LazyStrategy.ALL and
-                self._cache_strategy is _CacheStrategy.NONE)
-        self.__should_call_prefetch_processed = (
-                not self._parallelize_processing and
+                self._parallelize_processing):
+            flags |= _FLAG_RETURN_PROCESSED
+        if (self._lazy_strategy is _LazyStrategy.ALL and
+                self._cache_strategy is _CacheStrategy.NONE):
+            flags |= _FLAG_PREFETCH_SOURCE
+        if (not self._parallelize_processing and
                 self._lazy_strategy is _LazyStrategy.PROCESS and
-                self._cache_strategy is _CacheStrategy.PROCESSED)
-        self.__should_delete_source_in_add_cache = (
-                not self._supports_random_access and
+                self._cache_strategy is _CacheStrategy.PROCESSED):
+            flags |= _FLAG_PREFETCH_PROCESSED
+        if (not self._supports_random_access and
                 self._parallelize_processing and
                 self._uses_multi_processing and
                 self._lazy_strategy is _LazyStrategy.PROCESS and
-                self._cache_strategy is _CacheStrategy.PROCESSED)
+                self._cache_strategy is _CacheStrategy.PROCESSED):
+            flags |= _FLAG_DELETE_SOURCE_IN_ADD_CACHE
+        if self._lazy_strategy is _LazyStrategy.ALL:
+            flags |= _FLAG_YIELD_RAW_EXAMPLE
+        if (flags & _FLAG_PREFETCH_PROCESSED or
+                (not self._supports_random_access and
+                 self._cache_strategy is not _CacheStrategy.LOADED)):
+            flags |= _FLAG_PREFETCH_UNTIL_CACHED
+        self._flags = flags
 
         # Perform eager loading/processing if required.
+        contiguous_cache = hparams.contiguous_cache
         if self._lazy_strategy is _LazyStrategy.NONE:
             # Process entire dataset and cache.
-            self._processed_cache = [self.process(raw_example)
-                                     for raw_example in self._source]
+            examples = map(self.process, self._source)
+            cache = None
+            if contiguous_cache:
+                # If the dataset size is known in advance, allocate storage
+                # first and store examples as they are processed, instead of
+                # copying them from a list.
+                try:
+                    size = len(source)
+                except TypeError:
+                    pass
+                else:
+                    if self._max_dataset_size != -1:
+                        size = min(size, self._max_dataset_size)
+                    cache = self._create_contiguous_cache(size)
+                    contiguous_cache = False
+            if cache is not None:
+                cache.extend(examples)  # type: ignore
+                self._processed_cache = cache  # type: ignore
+            else:
+                self._processed_cache = list(examples)
             self._dataset_size = len(self._processed_cache)
             self._fully_cached = True
         else:
@@ -564,8 +811,18 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
 
             if self._cache_strategy is _CacheStrategy.PROCESSED:
                 # Data can be processed in arbitrary order, so they need to be
-                # reordered before storing in the cache list.
-                self._reorder_cache: Dict[int, Example] = {}
+                # reordered before storing in the cache list. Examples that
+                # arrive early are kept in a min-heap of
+                # `(index, arrival_count, example)`, where `arrival_count`
+                # breaks ties so that examples are never compared.
+                self._reorder_heap: List[Tuple[int, int, Example]] = []
+                self._reorder_count = 0
+
+        if contiguous_cache:
+            cache = self._create_contiguous_cache(self._dataset_size)
+            if cache is not None:
+                cache.extend(self._processed_cache)  # type: ignore
+                self._processed_cache = cache  # type: ignore
 
     @staticmethod
     def default_hparams():
@@ -587,6 +844,7 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
                 "lazy_strategy": 'none',
                 "cache_strategy": 'processed',
                 "parallelize_processing": True,
+                "contiguous_cache": False,
                 "name": "data"
             }
 
@@ -709,6 +967,21 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
             `none`. If `lazy_strategy` is `none`, processing will be
             performed on a single process regardless of this value.
 
+        `"contiguous_cache"`: bool
+            Whether to store processed examples in pre-allocated contiguous
+            tensors, instead of a Python list. This reduces memory overhead
+            and fragmentation when each processed example is a dictionary of
+            fixed-shape tensors.
+
+            This option requires the data class to implement
+            :meth:`example_spec`, and the dataset size to be known upon
+            construction, i.e., `lazy_strategy` is `none`, or the data
+            source supports random access or `lazy_strategy` is `process`.
+            It only takes effect when `cache_strategy` is `processed`, and
+            processed examples are actually cached, which is not the case
+            when `lazy_strategy` is `all` and `parallelize_processing` is
+            `False`. Otherwise, a warning is generated and a list is used.
+
         `"name"`: str
             Name of the data.
         """
@@ -731,6 +1004,7 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
             "lazy_strategy": 'none',
             "cache_strategy": 'processed',
             "parallelize_processing": True,
+            "contiguous_cache": False,
         }
 
     def to(self, device: Optional[torch.device]):
@@ -747,9 +1021,9 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         :meth:`texar.torch.data.data.DatasetBase._prefetch_source` if
         `parallelize_processing` is `False`."""
         if len(self._processed_cache) <= index:
+            indices = range(len(self._processed_cache), index + 1)
             self._processed_cache.extend(
-                self.process(self._source[x])
-                for x in range(len(self._processed_cache), index + 1))
+                map(self.process, map(self._source.__getitem__, indices)))
             if len(self._processed_cache) == self._dataset_size:
                 self._fully_cached = True
 
@@ -758,19 +1032,18 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         `__len__` is called before dataset size can be determined, or when using
         eager loading.
         """
-
+        max_index = 10 ** 8
         try:
-            max_index = 10 ** 8
             self._cached_source.prefetch(max_index)
+        except StopIteration:
+            pass
+        else:
             warnings.warn(
                 f"The data source contains more than {max_index:.2e} "
                 f"examples. Please check whether it is infinite.")
-            while True:
-                max_index *= 2
-                self._cached_source.prefetch(max_index)
-        except StopIteration:
-            self._dataset_size = self._cached_source.max_index + 1
-            return self._dataset_size
+            self._cached_source.prefetch_all()
+        self._dataset_size = self._cached_source.max_index + 1
+        return self._dataset_size
 
     def _prefetch_source(self, index: int) -> Optional[int]:
         r"""Prefetches data so `__getitem__` will be available. This method
@@ -790,15 +1063,22 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
             except StopIteration:
                 self._dataset_size = self._cached_source.max_index + 1
                 # self._cached_source.reset()
-                if self._should_call_prefetch_processed:
+                if self._flags & _FLAG_PREFETCH_PROCESSED:
                     self._prefetch_processed(self._dataset_size - 1)
                 return self._dataset_size
-            if self._should_call_prefetch_processed:
+            if self._flags & _FLAG_PREFETCH_PROCESSED:
                 self._prefetch_processed(index)
         else:
             # Dataset size must be known.
             if index >= self._dataset_size:  # type: ignore
+                # Samplers may still yield buffered indices after this point,
+                # so all remaining examples must be processed.
+                if self._flags & _FLAG_PREFETCH_PROCESSED:
+                    self._prefetch_processed(
+                        self._dataset_size - 1)  # type: ignore
                 return self._dataset_size
+            if self._flags & _FLAG_PREFETCH_PROCESSED:
+                self._prefetch_processed(index)
         return None
 
     def __len__(self) -> int:
@@ -824,21 +1104,123 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         """
         return raw_example  # type: ignore
 
+    def example_spec(self) -> Optional[ExampleSpec]:
+        r"""Returns the shapes and data types of processed examples.
+        Subclasses should implement this method to support the
+        `contiguous_cache` hyperparameter, in which case :meth:`process` must
+        return a dictionary of tensors with the specified shapes and data
+        types. Default implementation returns `None`, meaning that contiguous
+        caching is not supported.
+
+        Returns:
+            A dictionary mapping names to tuples of `(shape, dtype)`, where
+            `shape` is the shape of each tensor excluding the dataset
+            dimension, or `None`.
+        """
+        return None
+
+    def _create_contiguous_cache(self, size: Optional[int]) \
+            -> Optional[_ContiguousCache]:
+        r"""Creates a :class:`_ContiguousCache` for storing processed examples,
+        if possible. Called upon construction if the `contiguous_cache`
+        hyperparameter is `True`.
+
+        Args:
+            size: The number of examples to allocate storage for, or `None` if
+                the dataset size cannot be determined.
+
+        Returns:
+            The created cache, or `None` if contiguous caching is not possible
+            under the current settings, in which case a warning is generated.
+        """
+        if self._cache_strategy is not _CacheStrategy.PROCESSED:
+            warnings.warn(
+                f"'contiguous_cache' is ignored when using "
+                f"'{self._cache_strategy.value}' cache strategy.")
+            return None
+        if (self._lazy_strategy is _LazyStrategy.ALL and
+                not self._parallelize_processing):
+            # Processing is combined with loading by wrapping the data source,
+            # and processed examples are never stored in the cache.
+            warnings.warn(
+                "'contiguous_cache' is ignored when using 'all' lazy strategy "
+                "with 'parallelize_processing' set to False.")
+            return None
+        spec = self.example_spec()  # pylint: disable=assignment-from-none
+        if spec is None:
+            warnings.warn(
+                f"'contiguous_cache' is set to True, but "
+                f"{type(self).__name__} does not implement `example_spec`. "
+                f"Processed examples will be stored in a list.")
+            return None
+        if size is None:
+            warnings.warn(
+                "'contiguous_cache' is set to True, but the dataset size "
+                "cannot be determined upon construction. Processed examples "
+                "will be stored in a list.")
+            return None
+        return _ContiguousCache(spec, size)
+
     def __getitem__(self, index: Union[int, Tuple[int, RawExample]]) -> Example:
         if isinstance(index, int):
             if self._fully_cached:
                 return self._processed_cache[index]
             elif not self._parallelize_processing:
-                return self._transformed_source[index]
+                if self._flags & _FLAG_PREFETCH_PROCESSED:
+                    # Processing is performed in the main process, and
+                    # processed examples are prefetched into the cache.
+                    return self._processed_cache[index]
+                # Processing is combined with loading by wrapping the data
+                # source.
+                return self._source[index]  # type: ignore
             else:
                 return self.process(self._source[index])
         else:
-            # `index` is a tuple of (index, example).
+            # `index` is a tuple of (index, example). The sampler yields
+            # processed examples only when processing is performed in the main
+            # process, which implies that `parallelize_processing` is `False`.
+            # Tuples therefore carry raw examples exactly when processing is
+            # parallelized, and `process` is never called twice on the same
+            # example.
             if not self._parallelize_processing:
                 return index[1]  # type: ignore
             else:
                 return self.process(index[1])
 
+    def __getitems__(self, indices: List[Union[int, Tuple[int, RawExample]]]) \
+            -> List[Example]:
+        r"""Returns the examples for a batch of indices. This is called by
+        PyTorch :torch_docs:`DataLoader <data.html#torch.utils.data.DataLoader>`
+        (version 1.13 and above) to fetch a whole batch with one call, instead
+        of calling :meth:`__getitem__` for each index.
+
+        Args:
+            indices: A list of indices, or tuples of `(index, example)`.
+
+        Returns:
+            The list of processed examples.
+        """
+        if (type(self).__getitem__ is DatasetBase.__getitem__ and
+                (self._fully_cached or
+                 self._flags & _FLAG_PREFETCH_PROCESSED) and
+                all(map(isinstance, indices, itertools.repeat(int)))):
+            # Processed examples are read from the cache with a C-level loop.
+            # Other cases call into Python-level routines for each example
+            # anyway, and gain nothing over calling `__getitem__`, which also
+            # respects customized `__getitem__` in subclasses.
+            return list(map(self._processed_cache.__getitem__,
+                            cast(List[int], indices)))
+        return [self[index] for index in indices]
+
+    # Datasets are pickled when sent to worker processes that are not created
+    # by forking. Out-of-order examples are only merged into the cache on the
+    # main process, so pending examples in `_reorder_heap` are not included.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if "_reorder_heap" in state:
+            state["_reorder_heap"] = []
+        return state
+
     def _add_cached_examples(self, indices: List[int], examples: List[Example]):
         r"""Called by :class:`texar.torch.data.data._CacheDataLoaderIter` to
         cache examples processed in worker processes.
@@ -847,24 +1229,33 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
             indices: Indices for each example.
             examples: The examples processed in worker processes.
         """
-        if self._should_delete_source_in_add_cache:
+        if self._flags & _FLAG_DELETE_SOURCE_IN_ADD_CACHE:
             # In this case, `_CachedDataSource.__getitem__` will be
             # called on worker processes, so the cache cannot be
             # deleted. Thus, we move deletion to
             # `_add_cached_examples`.
             for index in indices:
-                del self._cached_source._cache[index]  # pylint: disable=protected-access
+                self._cached_source.erase(index)
+        cache = self._processed_cache
+        heap = self._reorder_heap
+        heappush, heappop = heapq.heappush, heapq.heappop
+        size = len(cache)
         for index, example in zip(indices, examples):
-            if index == len(self._processed_cache):
-                self._processed_cache.append(example)
-            else:
-                self._reorder_cache[index] = example
-
-        while len(self._processed_cache) in self._reorder_cache:
-            index = len(self._processed_cache)
-            self._processed_cache.append(self._reorder_cache[index])
-            del self._reorder_cache[index]
-        if len(self._processed_cache) == self._dataset_size:
+            if index == size:
+                cache.append(example)
+                size += 1
+            elif index > size:
+                heappush(heap, (index, self._reorder_count, example))
+                self._reorder_count += 1
+
+        # Entries with indices smaller than `size` are duplicates of cached
+        # examples, and are discarded.
+        while heap and heap[0][0] <= size:
+            index, _, example = heappop(heap)
+            if index == size:
+                cache.append(example)
+                size += 1
+        if size == self._dataset_size:
             self._fully_cached = True
 
     def _start_iteration(self) -> None:
@@ -879,13 +1270,13 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
     def num_epochs(self):
         r"""Number of epochs.
         """
-        return self._hparams.num_epochs
+        return self._num_epochs
 
     @property
     def batch_size(self):
         r"""The batch size.
         """
-        return self._hparams.batch_size
+        return self._batch_size
 
     @property
     def hparams(self):
@@ -948,7 +1339,7 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
             The collated batch.
         """
         batch = self.collate(examples)
-        if self._should_return_processed_examples:
+        if not self._fully_cached and self._flags & _FLAG_RETURN_PROCESSED:
             return examples, batch
         return batch
 
@@ -958,33 +1349,40 @@ class DatasetBase(Dataset, Generic[RawExample, Example], ABC):
         return the processed examples.
         """
         return (not self._fully_cached and
-                self.__should_return_processed_examples)
+                bool(self._flags & _FLAG_RETURN_PROCESSED))
 
     @property
     def _should_yield_raw_example(self):
         r"""Returns `True` if the sampler should yield raw examples.
         """
-        return (self._lazy_strategy is _LazyStrategy.ALL and
-                (self._cache_strategy is _CacheStrategy.NONE or
-                 not self._fully_cached))
+        flags = self._flags
+        return bool(flags & _FLAG_YIELD_RAW_EXAMPLE and
+                    (flags & _FLAG_PREFETCH_SOURCE or not self._fully_cached))
 
     @property
     def _should_call_prefetch_source(self):
         r"""Returns `True` if the sampler should call `_prefetch_source`.
+        This is the case when the dataset size is unknown, when raw examples
+        are not cached, or when raw examples are erased after access and
+        processed examples are not yet fully cached. Otherwise, the memoized
+        dataset size is used directly.
         """
+        flags = self._flags
         return (self._dataset_size is None or
-                self.__should_call_prefetch_source)
+                bool(flags & _FLAG_PREFETCH_SOURCE) or
+                (not self._fully_cached and
+                 bool(flags & _FLAG_PREFETCH_UNTIL_CACHED)))
 
     @property
     def _should_call_prefetch_processed(self):
         r"""Returns `True` if `_prefetch_source` should call
         `_prefetch_processed`.
         """
-        return self.__should_call_prefetch_processed
+        return bool(self._flags & _FLAG_PREFETCH_PROCESSED)
 
     @property
     def _should_delete_source_in_add_cache(self):
         r"""Returns `True` if `_add_cached_examples` should delete cached raw
         examples.
         """
-        return self.__should_delete_source_in_add_cache
+        return bool(self._flags & _FLAG_DELETE_SOURCE_IN_ADD_CACHE)
@@ -0,0 +1,360 @@
+"""
+Unit tests for data sources and other internals of data base classes.
+"""
+import itertools
+import unittest
+
+import torch
+
+from texar.torch.data.data.data_base import (
+    DatasetBase, FilterDataSource, IterDataSource, RecordDataSource,
+    SequenceDataSource, ZipDataSource, _CachedDataSource, _ContiguousCache)
+from texar.torch.data.data.data_iterators import DataIterator
+from texar.torch.data.data.dataset_utils import Batch
+
+
+class DataSourceTest(unittest.TestCase):
+    r"""Tests combinations of data sources.
+    """
+
+    def setUp(self) -> None:
+        self.numbers = list(range(10))
+        self.strings = [str(x) for x in self.numbers]
+
+    def test_zip(self):
+        source = ZipDataSource(SequenceDataSource(self.numbers),
+                               SequenceDataSource(self.strings))
+        expected = list(zip(self.numbers, self.strings))
+        self.assertEqual(len(source), len(expected))
+        self.assertEqual(list(source), expected)
+        self.assertEqual([source[idx] for idx in range(len(source))],
+                         expected)
+
+    def test_record(self):
+        source = RecordDataSource({
+            'number': SequenceDataSource(self.numbers),
+            'string': SequenceDataSource(self.strings),
+        })
+        expected = [{'number': number, 'string': string}
+                    for number, string in zip(self.numbers, self.strings)]
+        self.assertEqual(len(source), len(expected))
+        self.assertEqual(list(source), expected)
+        self.assertEqual([source[idx] for idx in range(len(source))],
+                         expected)
+
+    def test_filter(self):
+        source = FilterDataSource(IterDataSource(self.numbers),
+                                  lambda x: x % 3 == 0)
+        self.assertEqual(list(source), [0, 3, 6, 9])
+        source = FilterDataSource(IterDataSource(self.numbers), None)
+        self.assertEqual(list(source), self.numbers)
+
+
+class TruncatedDataSourceTest(unittest.TestCase):
+    r"""Tests truncation of data sources in data classes.
+    """
+
+    class MockData(DatasetBase):
+        def process(self, raw_example):
+            return raw_example + 1
+
+        def collate(self, examples):
+            return Batch(len(examples), value=examples)
+
+    def _test_data(self, size: int, max_size: int,
+                   support_random_access: bool, **kwargs):
+        hparams = {
+            'batch_size': 3,
+            'shuffle': False,
+            'max_dataset_size': max_size,
+            **kwargs,
+        }
+        data_source = (SequenceDataSource if support_random_access
+                       else IterDataSource)(list(range(size)))
+        data = self.MockData(data_source, hparams)
+        iterator = DataIterator(data)
+        for _ in range(2):
+            values = [x for batch in iterator for x in batch.value]
+            self.assertEqual(values, list(range(1, min(size, max_size) + 1)))
+
+    def test_truncation(self):
+        for lazy, cache in [('none', 'processed'), ('all', 'processed'),
+                            ('all', 'none'), ('all', 'loaded')]:
+            for parallelize in [True, False]:
+                for support_random_access in [True, False]:
+                    for size in [5, 20]:
+                        self._test_data(
+                            size, 10, support_random_access,
+                            lazy_strategy=lazy, cache_strategy=cache,
+                            parallelize_processing=parallelize)
+
+
+class CachedDataSourceTest(unittest.TestCase):
+    r"""Tests the cached data source wrapper.
+    """
+
+    def setUp(self) -> None:
+        self.size = 20
+        self.source = IterDataSource(list(range(self.size)))
+
+    def test_erase_after_access(self):
+        source = _CachedDataSource(self.source, erase_after_access=True)
+        source.prefetch(self.size // 2 - 1)
+        self.assertEqual(source.max_index, self.size // 2 - 1)
+
+        # Access out of order, as a shuffle buffer would.
+        for index in [3, 0, 1, 5, 2, 4]:
+            self.assertEqual(source[index], index)
+            with self.assertRaises(KeyError):
+                _ = source[index]
+        self.assertLessEqual(len(source._cache), self.size // 2)
+
+        source.prefetch(self.size - 1)
+        for index in range(6, self.size):
+            self.assertEqual(source[index], index)
+        self.assertEqual(len(source._cache), 0)
+        with self.assertRaises(StopIteration):
+            source.prefetch(self.size)
+
+        source.reset()
+        self.assertEqual(source.max_index, -1)
+        source.prefetch(0)
+        self.assertEqual(source[0], 0)
+
+    def test_erase(self):
+        source = _CachedDataSource(self.source, erase_after_access=True)
+        source.prefetch(self.size - 1)
+        for index in range(self.size // 2):
+            source.erase(index)
+        # Erasing stale, not yet prefetched, or erased examples is an error.
+        for index in [0, self.size // 2 - 1, self.size, self.size + 5]:
+            with self.assertRaises(KeyError):
+                source.erase(index)
+        self.assertEqual([source[index]
+                          for index in range(self.size // 2, self.size)],
+                         list(range(self.size // 2, self.size)))
+
+    def test_no_erase(self):
+        source = _CachedDataSource(self.source, erase_after_access=False)
+        source.prefetch(self.size - 1)
+        for _ in range(2):
+            for index in reversed(range(self.size)):
+                self.assertEqual(source[index], index)
+        self.assertEqual(len(source._cache), self.size)
+
+    def test_reset(self):
+        source = _CachedDataSource(self.source, erase_after_access=True)
+        source.prefetch_all()
+        # Nothing has been erased yet, so cached examples are kept.
+        source.reset()
+        self.assertEqual(source.max_index, self.size - 1)
+        self.assertEqual(source[0], 0)
+        # Restart from the data source once examples are erased.
+        source.reset()
+        self.assertEqual(source.max_index, -1)
+        source.prefetch(0)
+        self.assertEqual(source[0], 0)
+
+    def test_prefetch_all(self):
+        source = _CachedDataSource(self.source, erase_after_access=True)
+        source.prefetch(2)
+        self.assertEqual(source[0], 0)
+        source.prefetch_all()
+        self.assertEqual(source.max_index, self.size - 1)
+        self.assertEqual([source[index] for index in range(1, self.size)],
+                         list(range(1, self.size)))
+        with self.assertRaises(StopIteration):
+            source.prefetch(self.size)
+
+
+class GetItemsTest(unittest.TestCase):
+    r"""Tests fetching a batch of examples at once.
+    """
+
+    class MockData(DatasetBase):
+        def process(self, raw_example):
+            return raw_example * 2
+
+    def test_getitems(self):
+        size = 10
+        for lazy, cache in [('none', 'processed'), ('all', 'processed'),
+                            ('all', 'none'), ('process', 'loaded'),
+                            ('process', 'processed')]:
+            for parallelize in [True, False]:
+                data = self.MockData(SequenceDataSource(list(range(size))),
+                                     {'lazy_strategy': lazy,
+                                      'cache_strategy': cache,
+                                      'parallelize_processing': parallelize})
+                if data._should_call_prefetch_processed:
+                    data._prefetch_processed(size - 1)
+                indices = [3, 1, 4, 1, 5]
+                expected = [index * 2 for index in indices]
+                self.assertEqual(data.__getitems__(indices), expected)
+                self.assertEqual([data[index] for index in indices], expected)
+                self.assertEqual(data.__getitems__([]), [])
+                if not data._fully_cached:
+                    # The sampler yields examples along with indices.
+                    tuples = [(0, 7), (2, 8)]
+                    self.assertEqual(data.__getitems__(tuples),
+                                     [data[index] for index in tuples])
+                    mixed = [1, (2, 8)]
+                    self.assertEqual(data.__getitems__(mixed),
+                                     [data[index] for index in mixed])
+
+    def test_custom_getitem(self):
+        class CustomData(self.MockData):
+            def __getitem__(self, index):
+                return -super().__getitem__(index)
+
+        data = CustomData(SequenceDataSource(list(range(10))))
+        self.assertEqual(data.__getitems__([1, 2]), [-2, -4])
+
+    def test_process_once(self):
+        class CountingData(DatasetBase):
+            def process(self, raw_example):
+                self.num_calls += 1
+                return raw_example * 2
+
+            def collate(self, examples):
+                return Batch(len(examples), value=examples)
+
+        size = 23
+        # Whether buffered indices remain when the dataset size is reached is
+        # random, so shuffled settings are repeated.
+        for lazy, parallelize, shuffle in itertools.product(
+                ['none', 'process', 'all'], [True, False],
+                [False] + [True] * 10):
+            CountingData.num_calls = 0
+            data = CountingData(SequenceDataSource(list(range(size))),
+                                {'batch_size': 3,
+                                 'shuffle': shuffle,
+                                 'shuffle_buffer_size': 5,
+                                 'lazy_strategy': lazy,
+                                 'cache_strategy': 'processed',
+                                 'parallelize_processing': parallelize})
+            iterator = DataIterator(data)
+            for epoch in range(2):
+                values = [x for batch in iterator for x in batch.value]
+                if shuffle:
+                    values = sorted(values)
+                self.assertEqual(values, [x * 2 for x in range(size)])
+                # Each raw example is processed exactly once per epoch, and
+                # not at all once processed examples are cached.
+                expected = (size if epoch == 0 or not data._fully_cached
+                            else 0)
+                self.assertEqual(data.num_calls, expected)
+                data.num_calls = 0
+
+
+class ContiguousCacheTest(unittest.TestCase):
+    r"""Tests caching processed examples in contiguous tensors.
+    """
+
+    class TensorData(DatasetBase):
+        def process(self, raw_example):
+            return {
+                'ids': torch.full((3,), raw_example, dtype=torch.long),
+                'label': torch.tensor(raw_example % 2, dtype=torch.bool),
+            }
+
+        def example_spec(self):
+            return {
+                'ids': ((3,), torch.long),
+                'label': ((), torch.bool),
+            }
+
+        def collate(self, examples):
+            return Batch(
+                len(examples),
+                ids=torch.stack([ex['ids'] for ex in examples]),
+                label=torch.stack([ex['label'] for ex in examples]))
+
+    def setUp(self) -> None:
+        self.size = 21
+
+    def _test_data(self, lazy_strategy: str, num_workers: int, **kwargs):
+        hparams = {
+            'batch_size': 4,
+            'shuffle': False,
+            'lazy_strategy': lazy_strategy,
+            'num_parallel_calls': num_workers,
+            'contiguous_cache': True,
+            **kwargs,
+        }
+        data = self.TensorData(
+            SequenceDataSource(list(range(self.size))), hparams)
+        self.assertIsInstance(data._processed_cache, _ContiguousCache)
+        iterator = DataIterator(data)
+        for _ in range(2):
+            ids = torch.cat([batch.ids for batch in iterator])
+            self.assertEqual(ids.size(), (self.size, 3))
+            self.assertTrue(torch.equal(
+                ids[:, 0].sort()[0], torch.arange(self.size, dtype=torch.long)))
+        self.assertEqual(len(data._processed_cache), self.size)
+        self.assertTrue(torch.equal(data[5]['ids'], torch.full((3,), 5)))
+        self.assertTrue(data[5]['label'].item())
+
+    def test_contiguous_cache(self):
+        self._test_data('none', 0)
+        self._test_data('all', 0)
+        self._test_data('all', 2)
+        # Whether buffered indices remain when the dataset size is reached is
+        # random, so this is repeated.
+        for _ in range(10):
+            self._test_data('process', 0, parallelize_processing=False,
+                            shuffle=True, shuffle_buffer_size=5)
+
+    def test_fallback(self):
+        hparams = {
+            'lazy_strategy': 'all',
+            'contiguous_cache': True,
+        }
+        with self.assertWarns(UserWarning):
+            data = self.TensorData(
+                IterDataSource(list(range(self.size))), hparams)
+        self.assertIsInstance(data._processed_cache, list)
+
+        # Processed examples are not cached in this case.
+        hparams = {
+            'lazy_strategy': 'all',
+            'parallelize_processing': False,
+            'contiguous_cache': True,
+        }
+        with self.assertWarns(UserWarning):
+            data = self.TensorData(
+                SequenceDataSource(list(range(self.size))), hparams)
+        self.assertIsInstance(data._processed_cache, list)
+
+    def test_eager_unknown_size(self):
+        # Examples are processed into a list first, and then copied.
+        hparams = {
+            'lazy_strategy': 'none',
+            'contiguous_cache': True,
+        }
+        data = self.TensorData(IterDataSource(list(range(self.size))), hparams)
+        self.assertIsInstance(data._processed_cache, _ContiguousCache)
+        self.assertEqual(len(data._processed_cache), self.size)
+        self.assertTrue(torch.equal(data[7]['ids'], torch.full((3,), 7)))
+
+    def test_mismatch(self):
+        spec = {'ids': ((3,), torch.long)}
+        cache = _ContiguousCache(spec, 5)
+        for value in [torch.tensor([1]), torch.tensor([1.7, 1.7, 1.7]), 1]:
+            with self.assertRaises(ValueError):
+                cache.append({'ids': value})
+        self.assertEqual(len(cache), 0)
+
+    def test_bounds(self):
+        spec = {'ids': ((3,), torch.long)}
+        cache = _ContiguousCache(spec, 5)
+        cache.append({'ids': torch.full((3,), 7, dtype=torch.long)})
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(list(cache)), 1)
+        self.assertTrue(torch.equal(cache[-1]['ids'], cache[0]['ids']))
+        for index in [1, 4, -2]:
+            with self.assertRaises(IndexError):
+                _ = cache[index]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -331,7 +331,7 @@ class SingleDatasetIterator(DataLoader):
                  batching_strategy: Optional[BatchingStrategy] = None,
                  pin_memory: Optional[bool] = None):
         shuffle = dataset.hparams.shuffle
-        shuffle_buffer_size = dataset.hparams.shuffle_buffer_size
+        shuffle_buffer_size = dataset._shuffle_buffer_size
         sampler: SamplerBase
         if shuffle and shuffle_buffer_size is not None:
             sampler = BufferShuffleSampler(dataset, shuffle_buffer_size)
@@ -340,7 +340,7 @@ class SingleDatasetIterator(DataLoader):
         else:
             sampler = SequentialSampler(dataset)
 
-        num_workers = dataset.hparams.num_parallel_calls
+        num_workers = dataset._num_parallel_calls
         collate_fn = dataset._collate_and_maybe_return
 
         is_cuda = dataset.device is not None and dataset.device.type == "cuda"
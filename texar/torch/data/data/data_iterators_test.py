@@ -207,6 +207,44 @@ class DataIteratorTest(unittest.TestCase):
             self.assertLessEqual(len(batch), batch_size)
             self.assertLessEqual(sum(len(s) for s in batch.text), max_tokens)
 
+    def test_dynamic_batching_processed(self):
+        r"""Tests that :class:`texar.torch.data.BatchingStrategy` receives
+        processed examples under different dataset settings.
+        """
+        sent_lengths = np.random.randint(10, 20, size=(100,))
+        sentences = [['a'] * length for length in sent_lengths]
+
+        class CustomData(DatasetBase):
+            def process(self, raw_example):
+                return {'text': raw_example}
+
+            def collate(self, examples):
+                return Batch(len(examples),
+                             text=[ex['text'] for ex in examples])
+
+        batch_size = 5
+        max_tokens = 75
+        for lazy in ['none', 'process', 'all']:
+            for parallelize in [True, False]:
+                hparams = {
+                    'shuffle': False,
+                    'lazy_strategy': lazy,
+                    'cache_strategy': 'processed',
+                    'parallelize_processing': parallelize,
+                }
+                train_data = CustomData(SequenceDataSource(sentences), hparams)
+                strategy = TokenCountBatchingStrategy(
+                    max_tokens, batch_size, lambda ex: len(ex['text']))
+                iterator = DataIterator(train_data, strategy)
+                for _ in range(2):
+                    text = []
+                    for batch in iterator:
+                        self.assertLessEqual(len(batch), batch_size)
+                        self.assertLessEqual(
+                            sum(len(s) for s in batch.text), max_tokens)
+                        text.extend(batch.text)
+                    self.assertEqual(text, sentences)
+
     @patch("torch.cuda.is_available", lambda: True)
     def test_auto_storage_moving(self):
         cuda_tensors = set()
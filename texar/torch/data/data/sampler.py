@@ -85,14 +85,14 @@ class SamplerBase(torch_sampler.Sampler, Generic[Example]):
         r"""Return an iterator based on the dataset settings.
         """
         self.size = self._data._dataset_size
-        if (not self._data._fully_cached or
-                self._data._should_call_prefetch_source):
+        if self._data._should_call_prefetch_source:
             self._data._start_iteration()
             # First epoch of lazy loading, calling prefetch, and returning
             # indices and examples.
             iterator = self._iterator_unknown_size()
         else:
-            # Non-lazy loading, or when dataset has been fully iterated.
+            # Non-lazy loading, when dataset has been fully iterated, or when
+            # dataset size is known and all required examples are available.
             assert self.size is not None
             iterator = self._iterator_given_size(self.size)
 
@@ -163,9 +163,16 @@ class RandomSampler(SamplerBase[Example]):
         return iter(self._sampler)
 
     def _iterator_unknown_size(self) -> Iterator[int]:
-        raise TypeError(
-            "RandomSampler does not support lazy data loading. To perform "
-            "shuffling with lazy loading, use BufferShuffleSampler.")
+        if self.size is None:
+            raise TypeError(
+                "RandomSampler does not support lazy data loading. To perform "
+                "shuffling with lazy loading, use BufferShuffleSampler.")
+        # Dataset size is known, but examples must still be prefetched before
+        # being yielded, e.g., when processing is performed in the main
+        # process.
+        for index in self._sampler:
+            self._data._prefetch_source(index)
+            yield index
 
 
 class BufferShuffleSampler(SamplerBase[Example]):
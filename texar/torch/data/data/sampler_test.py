@@ -8,7 +8,7 @@ import numpy as np
 
 from texar.torch.data.data.data_base import (
     DatasetBase, DataSource, IterDataSource, SequenceDataSource)
-from texar.torch.data.data.sampler import BufferShuffleSampler
+from texar.torch.data.data.sampler import BufferShuffleSampler, RandomSampler
 
 
 class SamplerTest(unittest.TestCase):
@@ -17,7 +17,8 @@ class SamplerTest(unittest.TestCase):
 
     class MockDataBase(DatasetBase):
         def __init__(self, size: int, lazy_strategy: str,
-                     cache_strategy: str, unknown_size: bool = False):
+                     cache_strategy: str, unknown_size: bool = False,
+                     parallelize_processing: bool = True):
             data = list(range(size))
             source: DataSource[int]
             if unknown_size:
@@ -27,6 +28,7 @@ class SamplerTest(unittest.TestCase):
             hparams = {
                 'lazy_strategy': lazy_strategy,
                 'cache_strategy': cache_strategy,
+                'parallelize_processing': parallelize_processing,
             }
             super().__init__(source, hparams=hparams)
 
@@ -73,6 +75,28 @@ class SamplerTest(unittest.TestCase):
                                  unknown_size=True)
         self._test_data(data, returns_data=True)
 
+    def test_random_sampler_known_size(self):
+        strategies = [
+            ('none', 'processed'),
+            ('process', 'loaded'),
+            ('process', 'processed'),
+            ('all', 'loaded'),
+            ('all', 'processed'),
+        ]
+        for lazy, cache in strategies:
+            for parallelize in [True, False]:
+                data = self.MockDataBase(self.size, lazy, cache,
+                                         parallelize_processing=parallelize)
+                sampler = RandomSampler(data)
+                for _ in range(2):
+                    indices = [idx[0] if isinstance(idx, tuple) else idx
+                               for idx in sampler]
+                    self.assertEqual(sorted(indices), list(range(self.size)))
+        data = self.MockDataBase(self.size, 'all', 'processed',
+                                 unknown_size=True)
+        with self.assertRaises(TypeError):
+            _ = list(RandomSampler(data))
+
 
 if __name__ == "__main__":
     unittest.main()